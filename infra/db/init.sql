@@ -127,15 +127,101 @@ CREATE TABLE IF NOT EXISTS user_devices (
 );
 
 -- 4) audit log
+-- Range-partitioned by month on created_at so time-range queries prune to a
+-- few partitions and retention is a cheap DROP TABLE instead of a DELETE.
+-- The partition key has to be part of the primary key.
 CREATE TABLE IF NOT EXISTS audit_log (
-  id           BIGSERIAL PRIMARY KEY,
+  id           BIGSERIAL,
   booking_id   BIGINT NOT NULL,
   actor_id     BIGINT NOT NULL,
   action       TEXT   NOT NULL,   -- create|accept|confirm|complete|cancel
   from_status  TEXT,
   to_status    TEXT,
   meta         JSONB  NOT NULL DEFAULT '{}'::jsonb,
-  created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
-);
-CREATE INDEX IF NOT EXISTS idx_audit_log_booking ON audit_log(booking_id);
+  created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- safety net so inserts never fail if maintenance falls behind
+CREATE TABLE IF NOT EXISTS audit_log_default PARTITION OF audit_log DEFAULT;
+
+-- per-booking history (keyset on created_at, id)
+CREATE INDEX IF NOT EXISTS idx_audit_log_booking ON audit_log(booking_id, created_at, id);
+-- append-only, time-correlated rows: BRIN stays tiny and keeps inserts cheap
+CREATE INDEX IF NOT EXISTS brin_audit_log_created ON audit_log USING brin (created_at) WITH (pages_per_range = 32);
+
+-- create monthly partitions (UTC) from the current month up to months_ahead.
+-- Rows that landed in the default partition (maintenance was down) are moved
+-- into the new partition first; otherwise CREATE ... PARTITION OF would fail
+-- the default partition's constraint check and roll back every later month.
+-- Months older than the current one are covered too if the default holds them.
+CREATE OR REPLACE FUNCTION audit_log_ensure_partitions(months_ahead INT DEFAULT 3)
+RETURNS INT LANGUAGE plpgsql AS $$
+DECLARE
+  m       TIMESTAMP := date_trunc('month', NOW() AT TIME ZONE 'UTC');
+  stop    TIMESTAMP := date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => months_ahead);
+  oldest  TIMESTAMP;
+  lo      TIMESTAMPTZ;
+  hi      TIMESTAMPTZ;
+  part    TEXT;
+  moved   BIGINT;
+  created INT := 0;
+BEGIN
+  -- serialize concurrent callers (several booking replicas)
+  PERFORM pg_advisory_xact_lock(hashtext('audit_log_partitions'));
+
+  SELECT date_trunc('month', MIN(created_at) AT TIME ZONE 'UTC') INTO oldest FROM audit_log_default;
+  IF oldest IS NOT NULL AND oldest < m THEN
+    m := oldest;
+  END IF;
+
+  WHILE m <= stop LOOP
+    part := format('audit_log_%s', to_char(m, 'YYYY_MM'));
+    lo := m AT TIME ZONE 'UTC';
+    hi := (m + INTERVAL '1 month') AT TIME ZONE 'UTC';
+    IF to_regclass(part) IS NULL THEN
+      IF EXISTS (SELECT 1 FROM audit_log_default WHERE created_at >= lo AND created_at < hi) THEN
+        -- build standalone, move the stray rows in, then attach (indexes are added on attach)
+        EXECUTE format('CREATE TABLE %I (LIKE audit_log INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+        EXECUTE format(
+          'WITH mv AS (DELETE FROM audit_log_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+           INSERT INTO %I SELECT * FROM mv', lo, hi, part
+        );
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        EXECUTE format('ALTER TABLE audit_log ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, lo, hi);
+        RAISE NOTICE 'audit_log: moved % rows from default partition into %', moved, part;
+      ELSE
+        EXECUTE format('CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)', part, lo, hi);
+      END IF;
+      created := created + 1;
+    END IF;
+    m := m + INTERVAL '1 month';
+  END LOOP;
+  RETURN created;
+END$$;
+
+-- drop monthly partitions that ended more than retain_months ago
+CREATE OR REPLACE FUNCTION audit_log_drop_partitions(retain_months INT DEFAULT 12)
+RETURNS INT LANGUAGE plpgsql AS $$
+DECLARE
+  cutoff  TIMESTAMP := date_trunc('month', NOW() AT TIME ZONE 'UTC') - make_interval(months => retain_months);
+  part    TEXT;
+  dropped INT := 0;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('audit_log_partitions'));
+  FOR part IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'audit_log'::regclass
+      AND c.relname ~ '^audit_log_[0-9]{4}_[0-9]{2}$'
+  LOOP
+    IF to_date(substr(part, 11), 'YYYY_MM') < cutoff THEN
+      EXECUTE format('DROP TABLE %I', part);
+      dropped := dropped + 1;
+    END IF;
+  END LOOP;
+  RETURN dropped;
+END$$;
 
+SELECT audit_log_ensure_partitions(3);
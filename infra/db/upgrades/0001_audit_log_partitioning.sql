@@ -0,0 +1,40 @@
+-- infra/db/upgrades/0001_audit_log_partitioning.sql
+-- One-time upgrade for databases created before audit_log was partitioned.
+-- init.sql only runs on an empty data volume, so existing deployments keep the
+-- plain table and lack the partition functions until this is applied:
+--
+--   psql -h localhost -U kormo -d kormo -v ON_ERROR_STOP=1 \
+--     -f infra/db/upgrades/0001_audit_log_partitioning.sql
+--
+-- (run from the host with -f: \ir resolves init.sql relative to this file)
+--
+-- Copies the whole history under an exclusive lock, so run it in a
+-- maintenance window. Rows older than AUDIT_RETAIN_MONTHS are dropped by the
+-- next booking-go maintenance pass.
+
+BEGIN;
+
+LOCK TABLE audit_log IN ACCESS EXCLUSIVE MODE;
+
+-- move the old table and its named objects out of the way
+ALTER TABLE audit_log RENAME TO audit_log_legacy;
+ALTER INDEX audit_log_pkey RENAME TO audit_log_legacy_pkey;
+ALTER INDEX idx_audit_log_booking RENAME TO idx_audit_log_legacy_booking;
+ALTER SEQUENCE audit_log_id_seq RENAME TO audit_log_legacy_id_seq;
+
+-- partitioned table, indexes and functions (everything else there is IF NOT EXISTS)
+\ir ../init.sql
+
+-- history lands in the default partition first; ensure_partitions then
+-- carves it into monthly partitions
+INSERT INTO audit_log (id, booking_id, actor_id, action, from_status, to_status, meta, created_at)
+SELECT id, booking_id, actor_id, action, from_status, to_status, meta, created_at
+FROM audit_log_legacy;
+
+SELECT audit_log_ensure_partitions(3);
+
+SELECT setval(pg_get_serial_sequence('audit_log', 'id'), (SELECT COALESCE(MAX(id), 0) + 1 FROM audit_log), false);
+
+DROP TABLE audit_log_legacy;
+
+COMMIT;
@@ -1,15 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Header
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-from .db import get_db, engine
+from .db import get_db, engine, warm_pool
 from .models import Base, User
 from .schemas import OTPRequest, OTPVerify, TokenPair, UserOut
 from .jwt_utils import issue_access, issue_refresh, decode_token
 
-app = FastAPI(title="Auth Service", version="0.2.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables if not exist (MVP; later switch to Alembic)
+    Base.metadata.create_all(bind=engine)
+    warm_pool()
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    engine.dispose()
 
-# Create tables if not exist (MVP; later switch to Alembic)
-Base.metadata.create_all(bind=engine)
+app = FastAPI(title="Auth Service", version="0.2.0", lifespan=lifespan)
+app.state.ready = False
 
 @app.get("/health")
 def health():
@@ -17,11 +27,14 @@ def health():
 
 @app.get("/ready")
 def ready():
+    # not ready until lifespan warm-up has finished
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
     try:
         with engine.connect() as _:
             return {"ready": True}
     except Exception:
-        return {"ready": False}
+        return JSONResponse(status_code=503, content={"ready": False})
 
 # --- OTP (mock) ---
 # We will accept ANY phone; the "code" is 123456 for MVP.
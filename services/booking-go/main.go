@@ -3,6 +3,7 @@ package main
 import (
 	"context"
 	"crypto/sha256"
+	"encoding/base64"
 	"encoding/hex"
 	"encoding/json"
 	"errors"
@@ -143,6 +144,85 @@ func logAudit(ctx context.Context, bookingID, actorID int64, action, from, to st
 	}
 }
 
+// auditMaintenance keeps monthly audit_log partitions created ahead of time
+// and drops the ones past retention. Both SQL functions take an advisory lock,
+// so running this from every replica is safe.
+func auditMaintenance(ctx context.Context) {
+	ahead, err := strconv.Atoi(getenv("AUDIT_PARTITIONS_AHEAD", "3"))
+	if err != nil || ahead < 1 {
+		ahead = 3
+	}
+	retain, err := strconv.Atoi(getenv("AUDIT_RETAIN_MONTHS", "12"))
+	if err != nil {
+		retain = 12
+	}
+
+	run := func() {
+		var created, dropped int
+		if err := db.QueryRow(ctx, `SELECT audit_log_ensure_partitions($1)`, ahead).Scan(&created); err != nil {
+			log.Printf("[audit] ensure partitions failed: %v", err)
+		}
+		// retain <= 0 keeps history forever
+		if retain > 0 {
+			if err := db.QueryRow(ctx, `SELECT audit_log_drop_partitions($1)`, retain).Scan(&dropped); err != nil {
+				log.Printf("[audit] drop partitions failed: %v", err)
+			}
+		}
+		if created > 0 || dropped > 0 {
+			log.Printf("[audit] partitions created=%d dropped=%d", created, dropped)
+		}
+	}
+
+	run()
+	t := time.NewTicker(6 * time.Hour)
+	defer t.Stop()
+	for {
+		select {
+		case <-ctx.Done():
+			return
+		case <-t.C:
+			run()
+		}
+	}
+}
+
+type AuditEntry struct {
+	ID         int64          `json:"id"`
+	BookingID  int64          `json:"booking_id"`
+	ActorID    int64          `json:"actor_id"`
+	Action     string         `json:"action"`
+	FromStatus *string        `json:"from_status"`
+	ToStatus   *string        `json:"to_status"`
+	Meta       map[string]any `json:"meta"`
+	CreatedAt  time.Time      `json:"created_at"`
+}
+
+// audit cursors are opaque to clients: base64("<created_at unix nanos>:<id>")
+func encodeAuditCursor(e AuditEntry) string {
+	raw := strconv.FormatInt(e.CreatedAt.UnixNano(), 10) + ":" + strconv.FormatInt(e.ID, 10)
+	return base64.RawURLEncoding.EncodeToString([]byte(raw))
+}
+
+func decodeAuditCursor(c string) (time.Time, int64, error) {
+	raw, err := base64.RawURLEncoding.DecodeString(c)
+	if err != nil {
+		return time.Time{}, 0, err
+	}
+	ts, id, ok := strings.Cut(string(raw), ":")
+	if !ok {
+		return time.Time{}, 0, errors.New("malformed cursor")
+	}
+	nanos, err := strconv.ParseInt(ts, 10, 64)
+	if err != nil {
+		return time.Time{}, 0, err
+	}
+	n, err := strconv.ParseInt(id, 10, 64)
+	if err != nil {
+		return time.Time{}, 0, err
+	}
+	return time.Unix(0, nanos).UTC(), n, nil
+}
+
 // ---------- events ----------
 const bookingEventsChannel = "booking.events"
 
@@ -195,6 +275,17 @@ func main() {
 		rdb = nil
 	}
 
+	// audit_log partition upkeep
+	go auditMaintenance(ctx)
+	if d, err := time.ParseDuration(getenv("AUDIT_MAX_WINDOW", "24h")); err == nil && d > 0 {
+		auditMaxWindow = d
+	}
+	for _, v := range strings.Split(getenv("AUDIT_ADMIN_USER_IDS", ""), ",") {
+		if n, err := strconv.ParseInt(strings.TrimSpace(v), 10, 64); err == nil && n > 0 {
+			auditAdmins[n] = true
+		}
+	}
+
 	r := chi.NewRouter()
 
 	// public
@@ -218,6 +309,8 @@ func main() {
 		pr.Post("/bookings/{id}/complete", transition("CONFIRMED", "COMPLETED", "complete"))
 		pr.Post("/bookings/{id}/cancel", cancelBooking)
 		pr.Get("/bookings/{id}", getBooking)
+		pr.Get("/bookings/{id}/audit", listBookingAudit)
+		pr.Get("/audit", listAudit)
 	})
 
 	addr := ":8001"
@@ -473,6 +566,187 @@ func getBooking(w http.ResponseWriter, r *http.Request) {
 	writeJSON(w, http.StatusOK, b)
 }
 
+// ---------- audit reads ----------
+const (
+	auditDefaultLimit = 100
+	auditMaxLimit     = 1000
+)
+
+// widest from/to window for cross-booking audit reads (AUDIT_MAX_WINDOW)
+var auditMaxWindow = 24 * time.Hour
+
+// users allowed to read any booking's audit trail (AUDIT_ADMIN_USER_IDS, comma-separated)
+var auditAdmins = map[int64]bool{}
+
+func isAuditAdmin(ai *AuthInfo) bool {
+	return ai.Scope == "access" && auditAdmins[ai.UserID]
+}
+
+// GET /bookings/{id}/audit?cursor=&limit=
+func listBookingAudit(w http.ResponseWriter, r *http.Request) {
+	id, err := strconv.ParseInt(chi.URLParam(r, "id"), 10, 64)
+	if err != nil {
+		http.Error(w, `{"detail":"invalid booking id"}`, http.StatusBadRequest)
+		return
+	}
+	q := r.URL.Query()
+	q.Set("booking_id", strconv.FormatInt(id, 10))
+	r.URL.RawQuery = q.Encode()
+	listAudit(w, r)
+}
+
+// GET /audit?booking_id=&from=&to=&cursor=&limit=
+//
+// Keyset pagination on (created_at, id) instead of OFFSET. Two modes:
+//
+//   - booking_id (from/to optional): served in order by
+//     idx_audit_log_booking, so deep pages cost the same as the first. Open
+//     to the booking's customer/provider and to audit admins.
+//   - from + to, no booking_id (audit admins only): the only created_at index
+//     is the BRIN, which narrows the blocks but cannot return rows in order.
+//     The cursor adds a plain created_at >= bound (row comparisons are
+//     invisible to BRIN and partition pruning), so each page reads the rows
+//     from the cursor's timestamp to `to` and top-N sorts them. The window
+//     must be bounded and at most auditMaxWindow wide. There is deliberately
+//     no (created_at, id) btree, to keep inserts cheap.
+//
+// Audit admins are the user ids in AUDIT_ADMIN_USER_IDS, using a normal
+// access token from the auth service.
+func listAudit(w http.ResponseWriter, r *http.Request) {
+	ai := mustAuth(r)
+	q := r.URL.Query()
+
+	var bookingID int64
+	var from, to time.Time
+	if v := q.Get("booking_id"); v != "" {
+		id, err := strconv.ParseInt(v, 10, 64)
+		if err != nil {
+			http.Error(w, `{"detail":"invalid booking_id"}`, http.StatusBadRequest)
+			return
+		}
+		bookingID = id
+	}
+	if v := q.Get("from"); v != "" {
+		t, err := time.Parse(time.RFC3339, v)
+		if err != nil {
+			http.Error(w, `{"detail":"invalid from"}`, http.StatusBadRequest)
+			return
+		}
+		from = t
+	}
+	if v := q.Get("to"); v != "" {
+		t, err := time.Parse(time.RFC3339, v)
+		if err != nil {
+			http.Error(w, `{"detail":"invalid to"}`, http.StatusBadRequest)
+			return
+		}
+		to = t
+	}
+
+	if bookingID == 0 {
+		// time-range mode: cross-booking reads are for ops only, and must be bounded
+		if !isAuditAdmin(ai) {
+			http.Error(w, `{"detail":"forbidden"}`, http.StatusForbidden)
+			return
+		}
+		if from.IsZero() || to.IsZero() {
+			http.Error(w, `{"detail":"booking_id, or both from and to, is required"}`, http.StatusBadRequest)
+			return
+		}
+		if !to.After(from) || to.Sub(from) > auditMaxWindow {
+			http.Error(w, `{"detail":"from/to window must be positive and at most `+auditMaxWindow.String()+`"}`, http.StatusBadRequest)
+			return
+		}
+	} else if !isAuditAdmin(ai) {
+		var customerID, providerID int64
+		err := db.QueryRow(r.Context(), `SELECT customer_id, provider_id FROM bookings WHERE id=$1`, bookingID).
+			Scan(&customerID, &providerID)
+		if err != nil {
+			http.Error(w, `{"detail":"not found"}`, http.StatusNotFound)
+			return
+		}
+		if ai.UserID != customerID && ai.UserID != providerID {
+			http.Error(w, `{"detail":"forbidden"}`, http.StatusForbidden)
+			return
+		}
+	}
+
+	conds := []string{}
+	args := []any{}
+	arg := func(v any) string {
+		args = append(args, v)
+		return "$" + strconv.Itoa(len(args))
+	}
+	if bookingID != 0 {
+		conds = append(conds, "booking_id = "+arg(bookingID))
+	}
+	if !from.IsZero() {
+		conds = append(conds, "created_at >= "+arg(from))
+	}
+	if !to.IsZero() {
+		conds = append(conds, "created_at < "+arg(to))
+	}
+	if v := q.Get("cursor"); v != "" {
+		ts, id, err := decodeAuditCursor(v)
+		if err != nil {
+			http.Error(w, `{"detail":"invalid cursor"}`, http.StatusBadRequest)
+			return
+		}
+		// the plain bound lets BRIN and partition pruning start at the cursor;
+		// the row comparison then skips rows already returned at that instant
+		t := arg(ts)
+		conds = append(conds, "created_at >= "+t, "(created_at, id) > ("+t+", "+arg(id)+")")
+	}
+
+	limit := auditDefaultLimit
+	if v := q.Get("limit"); v != "" {
+		n, err := strconv.Atoi(v)
+		if err != nil || n < 1 || n > auditMaxLimit {
+			http.Error(w, `{"detail":"invalid limit"}`, http.StatusBadRequest)
+			return
+		}
+		limit = n
+	}
+
+	rows, err := db.Query(r.Context(), `
+		SELECT id, booking_id, actor_id, action, from_status, to_status, meta, created_at
+		FROM audit_log
+		WHERE `+strings.Join(conds, " AND ")+`
+		ORDER BY created_at, id
+		LIMIT `+arg(limit), args...)
+	if err != nil {
+		http.Error(w, `{"detail":"db error"}`, http.StatusInternalServerError)
+		return
+	}
+	defer rows.Close()
+
+	items := make([]AuditEntry, 0, limit)
+	for rows.Next() {
+		var e AuditEntry
+		if err := rows.Scan(&e.ID, &e.BookingID, &e.ActorID, &e.Action,
+			&e.FromStatus, &e.ToStatus, &e.Meta, &e.CreatedAt); err != nil {
+			http.Error(w, `{"detail":"db error"}`, http.StatusInternalServerError)
+			return
+		}
+		items = append(items, e)
+	}
+	if rows.Err() != nil {
+		http.Error(w, `{"detail":"db error"}`, http.StatusInternalServerError)
+		return
+	}
+
+	// a full page means there may be more; hand back where to resume
+	var next *string
+	if len(items) == limit {
+		c := encodeAuditCursor(items[len(items)-1])
+		next = &c
+	}
+	writeJSON(w, http.StatusOK, map[string]any{
+		"items":       items,
+		"next_cursor": next,
+	})
+}
+
 // ---------- response helper ----------
 func writeJSON(w http.ResponseWriter, code int, v any) {
 	w.Header().Set("Content-Type", "application/json")
@@ -0,0 +1,100 @@
+import threading, time
+
+class Coalescer:
+    """
+    Holds booking events for a short window keyed by (booking_id, user_id).
+    A newer event for the same key replaces the pending one, so a booking that
+    goes PENDING→ACCEPTED→CONFIRMED→COMPLETED inside the window produces a
+    single push with the final state.
+
+    The window starts at the first event for a key (it does not slide), so
+    delivery is delayed by at most hold_seconds + tick. Once any of a user's
+    keys is due, all of that user's pending keys go out in the same flush,
+    so a busy user's updates arrive together and can be rolled into a digest.
+
+    flush(batch) is called from the background thread with
+    {user_id: [(booking_id, payload, superseded_count), ...]}.
+    If it raises, the batch is put back and retried (up to max_attempts).
+    """
+
+    def __init__(self, flush, hold_seconds: float, tick: float = 0.25, max_attempts: int = 5):
+        self._flush = flush
+        self._hold = hold_seconds
+        self._tick = tick
+        self._max_attempts = max_attempts
+        self._pending = {}  # (booking_id, user_id) -> [due_at, payload, superseded, attempts]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.received = 0
+        self.superseded = 0
+        self.dropped = 0
+
+    def add(self, booking_id, user_ids, payload: dict):
+        now = time.monotonic()
+        with self._lock:
+            for uid in user_ids:
+                self.received += 1
+                entry = self._pending.get((booking_id, uid))
+                if entry is None:
+                    self._pending[(booking_id, uid)] = [now + self._hold, payload, 0, 0]
+                else:
+                    entry[1] = payload
+                    entry[2] += 1
+                    self.superseded += 1
+
+    def _take_due(self, force: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            users = {uid for (_, uid), e in self._pending.items() if force or e[0] <= now}
+            taken = {k: self._pending.pop(k) for k in [k for k in self._pending if k[1] in users]}
+        return taken
+
+    def _requeue(self, taken: dict):
+        now = time.monotonic()
+        with self._lock:
+            for key, (_, payload, superseded, attempts) in taken.items():
+                newer = self._pending.get(key)
+                if newer is not None:
+                    # a later event arrived meanwhile; it already carries the final state
+                    newer[2] += superseded + 1
+                    continue
+                attempts += 1
+                if attempts >= self._max_attempts:
+                    self.dropped += 1
+                    print(f"[COALESCE] giving up on booking#{key[0]} uid={key[1]} after {attempts} attempts")
+                    continue
+                self._pending[key] = [now + self._tick * (2 ** attempts), payload, superseded, attempts]
+
+    def flush_due(self, force: bool = False):
+        taken = self._take_due(force)
+        if not taken:
+            return
+        batch = {}
+        for (booking_id, uid), (_, payload, superseded, _) in taken.items():
+            batch.setdefault(uid, []).append((booking_id, payload, superseded))
+        try:
+            self._flush(batch)
+        except Exception as e:
+            print(f"[COALESCE ERROR] {e}; requeueing {len(taken)} notifications")
+            self._requeue(taken)
+
+    def _run(self):
+        while not self._stop.wait(self._tick):
+            self.flush_due()
+        # drain on shutdown so the final state is never dropped
+        for _ in range(self._max_attempts):
+            self.flush_due(force=True)
+            if not self._pending:
+                break
+            time.sleep(self._tick)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
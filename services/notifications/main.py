@@ -1,23 +1,95 @@
+from contextlib import asynccontextmanager, contextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import os, psycopg2, json, threading, time
+from psycopg2.pool import ThreadedConnectionPool
+import os, json, threading
 import redis
 
-app = FastAPI(title="Notification Service", version="0.2.0")
+from coalesce import Coalescer
 
 DB_DSN = f"dbname={os.getenv('DB_NAME','kormo')} user={os.getenv('DB_USER','kormo')} password={os.getenv('DB_PASS','kormo')} host={os.getenv('DB_HOST','postgres')} port={os.getenv('DB_PORT','5432')}"
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 EVENT_CHANNEL = "booking.events"
 
+# coalescing: hold booking events this long per (booking, user); 0 pushes immediately
+NOTIFY_HOLD_MS = int(os.getenv("NOTIFY_HOLD_MS", "1500"))
+# users with at least this many updates in one flush get a single digest; 0 disables
+NOTIFY_DIGEST_THRESHOLD = int(os.getenv("NOTIFY_DIGEST_THRESHOLD", "0"))
+
+# created in lifespan so importing this module has no side effects
+pool: ThreadedConnectionPool = None
+coalescer: Coalescer = None
+stop_event = threading.Event()
+subscribed = threading.Event()  # set while subscribed to EVENT_CHANNEL
+
+# psycopg2 pools raise PoolError when exhausted instead of blocking; this makes
+# callers (request threads, subscriber, coalescer) wait for a free connection
+pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+
+@contextmanager
 def conn():
-    return psycopg2.connect(DB_DSN)
+    # borrow a pooled connection; commit/rollback like psycopg2's own `with`
+    with pool_slots:
+        c = pool.getconn()
+        try:
+            with c:
+                yield c
+        finally:
+            pool.putconn(c)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pool, coalescer
+    # minconn connections are opened right here, before traffic arrives
+    pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, DB_DSN)
+    if NOTIFY_HOLD_MS > 0:
+        coalescer = Coalescer(deliver, NOTIFY_HOLD_MS / 1000.0)
+        coalescer.start()
+    stop_event.clear()
+    t = start_background()
+    # give the subscriber a moment so events published right after a deploy aren't missed
+    subscribed.wait(timeout=5)
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    stop_event.set()
+    t.join(timeout=5)
+    if coalescer:
+        coalescer.stop()  # flushes whatever is still held
+    pool.closeall()
+
+app = FastAPI(title="Notification Service", version="0.2.0", lifespan=lifespan)
+app.state.ready = False
 
 # --- API health ---
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+def ready():
+    # not ready until lifespan warm-up has finished
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    try:
+        with conn() as c:
+            with c.cursor() as cur:
+                cur.execute("SELECT 1")
+    except Exception:
+        return JSONResponse(status_code=503, content={"ready": False})
+    out = {"ready": True, "subscribed": subscribed.is_set()}
+    if coalescer:
+        out["coalesced"] = {
+            "received": coalescer.received,
+            "superseded": coalescer.superseded,
+            "dropped": coalescer.dropped,
+        }
+    return out
+
 # --- Direct notify endpoint (kept) ---
 class NotifyEvent(BaseModel):
     user_id: int
@@ -66,12 +138,11 @@ def handle_event(payload: dict):
       "body": "string",
       "meta": { ... }
     }
-    We push to BOTH parties (customer & provider).
+    We push to BOTH parties (customer & provider). With coalescing on,
+    events are held per (booking, user) and only the latest one is pushed.
     """
     try:
         booking_id = payload.get("id")
-        title = payload.get("title", "Booking update")
-        body  = payload.get("body",  f"Booking #{booking_id} updated")
         customer_id = payload.get("customer_id")
         provider_id = payload.get("provider_id")
 
@@ -79,36 +150,65 @@ def handle_event(payload: dict):
         if not targets:
             return
 
-        with conn() as c:
-            with c.cursor() as cur:
-                # fetch all device tokens for each target
-                cur.execute("""
-                  SELECT user_id, push_token, platform
-                  FROM user_devices
-                  WHERE user_id = ANY(%s)
-                """, (targets,))
-                rows = cur.fetchall()
-
-        if not rows:
-            print(f"[EVENT→PUSH] booking#{booking_id} no devices registered")
-            return
-
-        for uid, token, platform in rows:
-            print(f"[EVENT→PUSH] #{booking_id} → uid={uid} [{platform}|{token}] :: {title}: {body}")
+        if coalescer:
+            coalescer.add(booking_id, targets, payload)
+        else:
+            deliver({uid: [(booking_id, payload, 0)] for uid in targets})
 
     except Exception as e:
         print(f"[EVENT ERROR] {e}")
 
+def deliver(batch: dict):
+    """
+    batch: {user_id: [(booking_id, payload, superseded_count), ...]}
+    One device lookup covers every user in the batch.
+    """
+    with conn() as c:
+        with c.cursor() as cur:
+            # fetch all device tokens for each target
+            cur.execute("""
+              SELECT user_id, push_token, platform
+              FROM user_devices
+              WHERE user_id = ANY(%s)
+            """, (list(batch),))
+            rows = cur.fetchall()
+
+    devices = {}
+    for uid, token, platform in rows:
+        devices.setdefault(uid, []).append((token, platform))
+
+    for uid, items in batch.items():
+        if uid not in devices:
+            print(f"[EVENT→PUSH] uid={uid} no devices registered")
+            continue
+
+        if NOTIFY_DIGEST_THRESHOLD and len(items) >= NOTIFY_DIGEST_THRESHOLD:
+            ids = ", ".join(f"#{b}" for b, _, _ in items)
+            messages = [("digest", f"{len(items)} booking updates", f"Bookings {ids} were updated")]
+        else:
+            messages = [
+                (f"#{b}", p.get("title", "Booking update"), p.get("body", f"Booking #{b} updated"))
+                for b, p, _ in items
+            ]
+
+        for ref, title, body in messages:
+            for token, platform in devices[uid]:
+                print(f"[EVENT→PUSH] {ref} → uid={uid} [{platform}|{token}] :: {title}: {body}")
+
 def subscriber_thread():
-    # reconnect loop with simple backoff
+    # reconnect loop with simple backoff; exits once stop_event is set
     backoff = 1
-    while True:
+    while not stop_event.is_set():
         try:
             r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
             pubsub = r.pubsub()
             pubsub.subscribe(EVENT_CHANNEL)
+            subscribed.set()
             print(f"[SUB] listening on redis channel: {EVENT_CHANNEL}")
-            for msg in pubsub.listen():
+            backoff = 1
+            # poll with a timeout (not listen()) so shutdown is noticed
+            while not stop_event.is_set():
+                msg = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
                 if msg and msg.get("type") == "message":
                     data = msg.get("data")
                     try:
@@ -116,15 +216,16 @@ def subscriber_thread():
                         handle_event(payload)
                     except Exception as e:
                         print(f"[SUB ERROR] bad payload: {e} :: {data}")
-            backoff = 1
+            subscribed.clear()
+            pubsub.close()
         except Exception as e:
+            subscribed.clear()
             print(f"[SUB ERROR] {e}; retrying in {backoff}s")
-            time.sleep(backoff)
+            stop_event.wait(backoff)
             backoff = min(backoff*2, 30)
 
-# Start subscriber when app starts
+# Started once from lifespan (not at import)
 def start_background():
     t = threading.Thread(target=subscriber_thread, daemon=True)
     t.start()
-
-start_background()
+    return t
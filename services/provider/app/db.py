@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from .config import DATABASE_URL
@@ -6,6 +6,14 @@ from .config import DATABASE_URL
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+def warm_pool():
+    """Open every pooled connection up front so first requests skip the connect."""
+    conns = [engine.connect() for _ in range(engine.pool.size())]
+    for c in conns:
+        c.execute(text("SELECT 1"))
+    for c in conns:
+        c.close()
+
 def get_db():
     db = SessionLocal()
     try:
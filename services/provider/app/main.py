@@ -1,11 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from .routers import providers
 from .models import Base
-from .db import engine, SessionLocal
+from .db import engine, SessionLocal, warm_pool
 from pydantic import BaseModel
 from sqlalchemy import text
 
-app = FastAPI(title="Provider Service", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_pool()
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    engine.dispose()
+
+app = FastAPI(title="Provider Service", version="0.1.0", lifespan=lifespan)
+app.state.ready = False
 
 # Temporary auth stub until Auth service integration
 def auth_required():
@@ -24,11 +35,14 @@ def health():
 
 @app.get("/ready")
 def ready():
+    # not ready until lifespan warm-up has finished
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
     try:
         with engine.connect() as _:
             return {"ready": True}
     except Exception:
-        return {"ready": False}
+        return JSONResponse(status_code=503, content={"ready": False})
 
 app.include_router(providers.router)
 
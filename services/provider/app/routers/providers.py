@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import List
 
 from ..db import get_db
-from .. import models, schemas
+from ..config import FAST_JSON
+from .. import models, schemas, fastjson
 
 router = APIRouter(prefix="/providers", tags=["providers"])
 
 @router.get("", response_model=List[schemas.ProviderOut])
-def list_providers(db: Session = Depends(get_db)):
+def list_providers(request: Request, db: Session = Depends(get_db)):
+    if FAST_JSON:
+        # plain column tuples straight to orjson; skips ORM objects and ProviderOut
+        cols = [getattr(models.Provider, f) for f in schemas.ProviderOut.model_fields]
+        result = db.execute(select(*cols).order_by(models.Provider.id.desc()).limit(50))
+        rows = fastjson.rows_to_dicts(tuple(result.keys()), result.all())
+        return fastjson.json_response(fastjson.dumps(rows), request)
+
     rows = db.query(models.Provider).order_by(models.Provider.id.desc()).limit(50).all()
     return rows
 
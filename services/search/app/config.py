@@ -11,3 +11,14 @@ REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB   = int(os.getenv("REDIS_DB", "0"))
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "30"))
+
+# Matchmaking (/search/match): default weights and candidate pool size
+MATCH_W_DISTANCE = float(os.getenv("MATCH_W_DISTANCE", "0.5"))
+MATCH_W_RATING   = float(os.getenv("MATCH_W_RATING", "0.3"))
+MATCH_W_VERIFIED = float(os.getenv("MATCH_W_VERIFIED", "0.1"))
+MATCH_W_PRICE    = float(os.getenv("MATCH_W_PRICE", "0.1"))
+MATCH_CANDIDATE_LIMIT = int(os.getenv("MATCH_CANDIDATE_LIMIT", "10000"))
+
+# Fast JSON path (orjson straight from row tuples, cached bytes served as-is)
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
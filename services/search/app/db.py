@@ -1,10 +1,19 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from .config import DATABASE_URL
 
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+def warm_pool():
+    """Open every pooled connection up front so first requests skip the connect."""
+    conns = [engine.connect() for _ in range(engine.pool.size())]
+    for c in conns:
+        # touch PostGIS so each backend loads the extension library now, not on a user query
+        c.execute(text("SELECT ST_DWithin(ST_MakePoint(0, 0)::geography, ST_MakePoint(0, 0)::geography, 1)"))
+    for c in conns:
+        c.close()
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,71 @@
+import gzip
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli  # optional; gzip is used when missing
+except ImportError:
+    brotli = None
+
+from .config import COMPRESS_MIN_BYTES
+
+def rows_to_dicts(columns, rows):
+    """
+    Zip DB row tuples with column names; no ORM/Pydantic objects in between.
+    One dict per row plus a single orjson call beats encoding each value
+    separately from the tuple in Python.
+    """
+    return [dict(zip(columns, row)) for row in rows]
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+
+def _accepted(header: str) -> set:
+    # codings the client accepts with q > 0
+    out = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            out.add(coding.strip().lower())
+    return out
+
+def preferred_encoding(request: Request):
+    """br, then gzip, if the client accepts it; None for identity."""
+    accepted = _accepted(request.headers.get("accept-encoding", ""))
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=5)
+
+def encoded_response(body: bytes, encoding=None, status_code: int = 200) -> Response:
+    """Send JSON bytes as-is; `encoding` says how they are already compressed."""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+def json_response(body: bytes, request: Request, status_code: int = 200) -> Response:
+    """
+    Send already-encoded JSON bytes, compressed (br, then gzip) when the
+    payload is large enough and the client accepts it.
+    """
+    encoding = preferred_encoding(request) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+    return encoded_response(body, encoding, status_code)
@@ -1,16 +1,42 @@
 import json
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from redis import Redis
 
-from .db import get_db
-from .config import REDIS_HOST, REDIS_PORT, REDIS_DB, CACHE_TTL_SECONDS
+from .db import get_db, engine, warm_pool
+from .config import (
+    REDIS_HOST, REDIS_PORT, REDIS_DB, CACHE_TTL_SECONDS, MATCH_CANDIDATE_LIMIT, FAST_JSON, COMPRESS_MIN_BYTES
+)
+from . import fastjson
+from .schemas import MatchRequest, MatchResponse, MatchHit
+from .matching import score_candidates
 
-app = FastAPI(title="Search Service", version="0.1.0")
+# simple global redis client (sync); created in lifespan, not at import.
+# Raw bytes (no decode) so cached JSON can be sent without a decode/encode round trip.
+r: Redis = None
 
-# simple global redis client (sync)
-r = Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global r
+    r = Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
+    try:
+        r.ping()  # opens the first pooled connection
+    except Exception:
+        pass  # search works without cache; /health reports degraded
+    warm_pool()
+    # first NumPy call pays for lazy imports/allocations; do it here
+    score_candidates([(0, "", True, 5.0, "mid", 0.0)], 1.0, "mid")
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    r.close()
+    engine.dispose()
+
+app = FastAPI(title="Search Service", version="0.1.0", lifespan=lifespan)
+app.state.ready = False
 
 @app.get("/health")
 def health():
@@ -22,15 +48,42 @@ def health():
 
 @app.get("/ready")
 def ready(db: Session = Depends(get_db)):
+    # not ready until lifespan warm-up has finished
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
     try:
         db.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(status_code=503, content={"ready": False})
+    # search works without cache: a Redis outage is reported, not fatal
+    try:
         r.ping()
-        return {"ready": True}
+        cache = "ok"
     except Exception:
-        return {"ready": False}
+        cache = "degraded"
+    return {"ready": True, "cache": cache}
+
+def cached_response(cache_key: str, body: bytes, encoding, ttl_ms: int = None):
+    """
+    Respond with cached JSON bytes, compressing once per encoding. The
+    compressed variant is cached next to the raw bytes and expires with them,
+    so later hits skip compression entirely. ttl_ms=None means "whatever the
+    raw entry has left"; it is only looked up when a variant is written.
+    """
+    if not encoding or len(body) < COMPRESS_MIN_BYTES:
+        return fastjson.encoded_response(body)
+    body = fastjson.compress(body, encoding)
+    try:
+        if ttl_ms is None:
+            ttl_ms = r.pttl(cache_key)
+        if ttl_ms > 0:
+            r.psetex(f"{cache_key}:{encoding}", ttl_ms, body)
+    except Exception:
+        pass  # no cache is fine
+    return fastjson.encoded_response(body, encoding)
 
 @app.post("/search/providers")
-def search_providers(payload: dict, db: Session = Depends(get_db)):
+def search_providers(payload: dict, request: Request, db: Session = Depends(get_db)):
     # validate inputs (lightweight to keep dependencies small)
     try:
         lat = float(payload["lat"])
@@ -44,9 +97,17 @@ def search_providers(payload: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Out of bounds")
 
     cache_key = f"search:{lat:.5f}:{lon:.5f}:{radius_km:.2f}:{limit}"
+    encoding = fastjson.preferred_encoding(request) if FAST_JSON else None
     try:
+        if encoding:
+            # already-compressed variant: served without touching the payload
+            body = r.get(f"{cache_key}:{encoding}")
+            if body:
+                return fastjson.encoded_response(body, encoding)
         cached = r.get(cache_key)
         if cached:
+            if FAST_JSON:
+                return cached_response(cache_key, cached, encoding)
             return json.loads(cached)
     except Exception:
         cached = None  # cache miss or redis down; continue
@@ -71,14 +132,24 @@ def search_providers(payload: dict, db: Session = Depends(get_db)):
         LIMIT :limit
     """)
 
-    rows = db.execute(sql, {
+    result = db.execute(sql, {
         "lat": lat,
         "lon": lon,
         "radius_meters": int(radius_km * 1000),
         "limit": limit
-    }).mappings().all()
+    })
+
+    if FAST_JSON:
+        # row tuples → plain dicts → orjson bytes; the same bytes go to Redis and the client
+        hits = fastjson.rows_to_dicts(tuple(result.keys()), result.all())
+        body = fastjson.dumps({"count": len(hits), "hits": hits})
+        try:
+            r.setex(cache_key, CACHE_TTL_SECONDS, body)
+        except Exception:
+            pass  # no cache is fine
+        return cached_response(cache_key, body, encoding, CACHE_TTL_SECONDS * 1000)
 
-    hits = [dict(row) for row in rows]
+    hits = [dict(row) for row in result.mappings().all()]
     resp = {"count": len(hits), "hits": hits}
 
     try:
@@ -87,3 +158,47 @@ def search_providers(payload: dict, db: Session = Depends(get_db)):
         pass  # no cache is fine
 
     return resp
+
+@app.post("/search/match", response_model=MatchResponse)
+def match_providers(payload: MatchRequest, db: Session = Depends(get_db)):
+    # nearest candidates only; ranking happens in NumPy, not SQL
+    sql = text("""
+        SELECT
+          p.id, p.name, p.verified, p.rating_avg, p.price_band,
+          ST_Distance(
+            ST_SetSRID(ST_MakePoint(p.lon, p.lat), 4326)::geography,
+            ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography
+          ) / 1000.0 AS distance_km
+        FROM providers p
+        WHERE p.lat IS NOT NULL AND p.lon IS NOT NULL
+          AND ST_DWithin(
+            ST_SetSRID(ST_MakePoint(p.lon, p.lat), 4326)::geography,
+            ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+            :radius_meters
+          )
+        ORDER BY distance_km ASC
+        LIMIT :limit
+    """)
+
+    # plain tuples: cheaper than mappings and what the scorer unpacks
+    rows = db.execute(sql, {
+        "lat": payload.lat,
+        "lon": payload.lon,
+        "radius_meters": int(payload.radius_km * 1000),
+        "limit": MATCH_CANDIDATE_LIMIT
+    }).all()
+
+    weights = payload.weights.model_dump(exclude_none=True) if payload.weights else None
+    try:
+        ranked = score_candidates(rows, payload.radius_km, payload.price_band, weights, payload.k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    hits = [
+        MatchHit(
+            id=row[0], name=row[1], verified=row[2], rating_avg=row[3], price_band=row[4],
+            distance_km=row[5], score=score, breakdown=breakdown
+        )
+        for row, score, breakdown in ranked
+    ]
+    return MatchResponse(count=len(hits), candidates=len(rows), hits=hits)
@@ -0,0 +1,72 @@
+import numpy as np
+
+from .config import MATCH_W_DISTANCE, MATCH_W_RATING, MATCH_W_VERIFIED, MATCH_W_PRICE
+
+# price bands in ascending order; fit is 1 - normalized rank distance
+PRICE_BANDS = ("low", "mid", "high")
+_BAND_RANK = {b: i for i, b in enumerate(PRICE_BANDS)}
+
+# neutral values for providers with missing data (don't bury new providers)
+NEUTRAL_RATING = 0.5
+NEUTRAL_PRICE_FIT = 0.5
+
+COMPONENTS = ("distance", "rating", "verified", "price")
+
+DEFAULT_WEIGHTS = {
+    "distance": MATCH_W_DISTANCE,
+    "rating": MATCH_W_RATING,
+    "verified": MATCH_W_VERIFIED,
+    "price": MATCH_W_PRICE,
+}
+
+def score_candidates(rows, radius_km: float, price_band=None, weights=None, k: int = 10):
+    """
+    Score candidate rows in one vectorized pass and return the top-k.
+
+    rows: sequence of (id, name, verified, rating_avg, price_band, distance_km) tuples
+    Returns [(row, total_score, {component: weighted contribution})] best first.
+    """
+    if not rows:
+        return []
+
+    w = dict(DEFAULT_WEIGHTS)
+    if weights:
+        w.update(weights)
+    w_vec = np.array([w[c] for c in COMPONENTS], dtype=np.float64)
+    w_sum = w_vec.sum()
+    if w_sum <= 0:
+        raise ValueError("weights must sum to a positive value")
+    w_vec /= w_sum
+
+    # column-wise unpack once; everything after this is array math
+    _, _, verified, rating, bands, dist = zip(*rows)
+    dist = np.fromiter(dist, dtype=np.float64, count=len(rows))
+    rating = np.array(rating, dtype=np.float64)          # None -> nan
+    verified = np.fromiter(verified, dtype=np.float64, count=len(rows))
+
+    comp = np.empty((len(COMPONENTS), len(rows)), dtype=np.float64)
+    comp[0] = np.clip(1.0 - dist / radius_km, 0.0, 1.0)
+    comp[1] = np.where(np.isnan(rating), NEUTRAL_RATING, np.clip(rating / 5.0, 0.0, 1.0))
+    comp[2] = verified
+
+    want = _BAND_RANK.get(price_band.lower()) if price_band else None
+    if want is None:
+        # no (known) requested band: price fit does not discriminate
+        comp[3] = 1.0
+    else:
+        rank = np.array([_BAND_RANK.get((b or "").lower(), -1) for b in bands], dtype=np.float64)
+        fit = 1.0 - np.abs(rank - want) / (len(PRICE_BANDS) - 1)
+        comp[3] = np.where(rank < 0, NEUTRAL_PRICE_FIT, fit)
+
+    contrib = comp * w_vec[:, None]
+    total = contrib.sum(axis=0)
+
+    k = min(k, len(rows))
+    top = np.argpartition(-total, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+    # best score first, nearer provider wins ties
+    top = top[np.lexsort((dist[top], -total[top]))]
+
+    return [
+        (rows[i], float(total[i]), {c: float(contrib[j, i]) for j, c in enumerate(COMPONENTS)})
+        for i in top
+    ]
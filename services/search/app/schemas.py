@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 
 class ProviderHit(BaseModel):
     id: int
@@ -21,3 +21,33 @@ class SearchRequest(BaseModel):
 class SearchResponse(BaseModel):
     count: int
     hits: List[ProviderHit]
+
+class MatchWeights(BaseModel):
+    # finite and bounded: inf/nan would turn every normalized score into NaN
+    distance: Optional[float] = Field(default=None, ge=0, le=100, allow_inf_nan=False)
+    rating: Optional[float] = Field(default=None, ge=0, le=100, allow_inf_nan=False)
+    verified: Optional[float] = Field(default=None, ge=0, le=100, allow_inf_nan=False)
+    price: Optional[float] = Field(default=None, ge=0, le=100, allow_inf_nan=False)
+
+class MatchRequest(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+    radius_km: float = Field(gt=0, le=50)
+    k: int = Field(default=5, ge=1, le=100)
+    price_band: Optional[Literal["low", "mid", "high"]] = None  # see matching.PRICE_BANDS
+    weights: Optional[MatchWeights] = None  # overrides server defaults per field
+
+class MatchHit(BaseModel):
+    id: int
+    name: str
+    verified: bool
+    rating_avg: Optional[float]
+    price_band: Optional[str]
+    distance_km: float
+    score: float
+    breakdown: Dict[str, float]
+
+class MatchResponse(BaseModel):
+    count: int
+    candidates: int
+    hits: List[MatchHit]